@@ -23,13 +23,23 @@
 import os
 import re
 import json
+import codecs
+import hashlib
 import logging
-import random
-from typing import Dict, List, Tuple, Optional, Any
+import time
+import functools
+import itertools
+import threading
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Set, Tuple, Optional, Any, Iterator
 from datetime import datetime
+from html import escape as html_escape
+from urllib.parse import urlparse
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from lxml import etree, html as lxml_html
 
 # =============================================================================
 # 日志配置
@@ -41,6 +51,51 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# =============================================================================
+# 关键词匹配
+# =============================================================================
+# 标题中的标点、符号和空白，\w已包含中文字符
+_TITLE_NOISE_PATTERN = re.compile(r'[\W_]+')
+
+
+def _compile_keywords(keywords: Tuple[str, ...]) -> re.Pattern:
+    """
+    将关键词列表编译为单个正则，一次扫描即可判断文本是否包含任意关键词
+    """
+    return re.compile('|'.join(re.escape(keyword) for keyword in keywords))
+
+
+def _title_key(title: str) -> str:
+    """
+    将标题归一化为去重键：去掉标点和空白后取前32个字符，
+    "A股开门红！"与"A股开门红"等仅标点或空白不同的标题视为同一条新闻
+    """
+    return _TITLE_NOISE_PATTERN.sub('', title)[:32]
+
+
+def _build_keyword_index(keyword_map: Dict[str, Tuple[str, ...]]) -> Dict[str, str]:
+    """
+    将{分类: 关键词元组}展开为{关键词: 分类}的反向索引
+
+    保持原有的遍历顺序，同一关键词出现在多个分类中时归属第一个分类，
+    按索引顺序查找与逐个分类、逐个关键词查找的结果一致。
+    """
+    index = {}
+    for category, keywords in keyword_map.items():
+        for keyword in keywords:
+            index.setdefault(keyword, category)
+    return index
+
+
+def _class_xpath(tag: str, class_name: str) -> etree.XPath:
+    """
+    编译匹配class中包含指定类名的第一个元素的XPath
+    """
+    return etree.XPath(
+        f"(//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')])[1]"
+    )
+
+
 class NewsFetcher:
     """
     财经新闻获取器
@@ -55,26 +110,435 @@ class NewsFetcher:
 
     REQUEST_INTERVAL = 1.0
 
-    _last_request_time = 0.0
+    # 同一主机允许的突发请求数，超出后按REQUEST_INTERVAL的速率补充
+    REQUEST_BURST = 4
+
+    # 临时错误的最大重试次数及需要重试的状态码，重试同样经过按主机限速
+    MAX_RETRIES = 3
+
+    RETRY_STATUSES = (502, 503, 504)
+
+    # 并发获取新闻详情的线程数，不超过连接池大小
+    DETAIL_WORKERS = 8
+
+    # 详情页最多读取的字节数，正文位于页面前部，其后的评论、相关推荐等不再下载和解析
+    DETAIL_MAX_BYTES = 256 * 1024
+
+    # 按主机记录令牌桶状态(剩余令牌, 更新时间)，不同网站之间互不阻塞
+    _host_tokens: Dict[str, Tuple[float, float]] = {}
+
+    _request_lock = threading.Lock()
+
+    _session: Optional[requests.Session] = None
+
+    # 条件请求缓存目录，保存页面的ETag/Last-Modified及解析结果
+    HTTP_CACHE_DIR = '.cache'
+
+    # 缓存中保存的是解析后的结果而非原始页面，修改链接解析、正文提取或截取逻辑时需递增此版本，
+    # 版本不一致的旧记录按未命中处理，不会在304时继续返回旧解析器的结果
+    HTTP_CACHE_VERSION = 1
+
+    # 缓存记录的最长保留时间，超过后从磁盘删除，缓存目录不会随运行次数无限增长
+    HTTP_CACHE_MAX_AGE = 3 * 24 * 3600
+
+    # 缓存有效期(秒)，有效期内直接使用缓存结果，不再发起请求
+    DETAIL_CACHE_TTL = 6 * 3600
+
+    LISTING_CACHE_TTL = 300
+
+    # 已失效(404/410)的详情页缓存较短时间，避免短时间内反复请求失效链接
+    NEGATIVE_CACHE_TTL = 300
+
+    # 表示链接已失效的状态码，只有这些响应写入空结果；超时、5xx等临时错误不缓存
+    NEGATIVE_CACHE_STATUSES = (404, 410)
+
+    # 页面meta中声明的编码，只在页面开头4096字节内查找
+    _META_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+
+    # 响应头和页面meta都没有声明编码时使用的默认编码
+    DEFAULT_ENCODING = 'utf-8'
+
+    # 新浪财经标题过滤关键词
+    FINANCE_KEYWORDS = ('经济', '股票', '基金', '金融', '市场', '投资', '理财', 'A股', '港股', '美股', '债券', 'ETF')
+
+    # 基金频道标题过滤关键词
+    FUND_KEYWORDS = ('基金', 'ETF', '股票', '金融', '市场', '投资', '理财')
+
+    _FINANCE_KEYWORD_PATTERN = _compile_keywords(FINANCE_KEYWORDS)
+
+    _FUND_KEYWORD_PATTERN = _compile_keywords(FUND_KEYWORDS)
+
+    # 需要跳过的链接关键词（脚本、邮件、锚点、登录注册等非新闻链接）
+    BLOCKED_LINK_KEYWORDS = ('javascript:', 'mailto:', '#', 'login', 'register')
+
+    _BLOCKED_LINK_PATTERN = _compile_keywords(BLOCKED_LINK_KEYWORDS)
+
+    # 新浪财经额外跳过视频链接
+    _BLOCKED_SINA_LINK_PATTERN = _compile_keywords(BLOCKED_LINK_KEYWORDS + ('video',))
+
+    # 基金频道只跳过脚本和锚点链接
+    _BLOCKED_FUND_LINK_PATTERN = _compile_keywords(('javascript:', '#'))
+
+    # 常见的正文容器，按优先级排列；XPath在导入时编译，匹配在libxml2中完成
+    _CONTENT_MATCHERS = (
+        _class_xpath('div', 'art_context_box'),  # 东方财富网
+        etree.XPath("(//div[@id='ContentBody'])[1]"),  # 东方财富网另一种格式
+        _class_xpath('div', 'article-content'),  # 东方财富网
+        _class_xpath('div', 'article'),  # 新浪财经
+        _class_xpath('div', 'content'),
+        _class_xpath('div', 'main-content'),
+        etree.XPath('(//article)[1]'),
+        _class_xpath('div', 'newsContent'),  # 其他网站
+        _class_xpath('div', 'post-content'),  # 其他网站
+    )
+
+    # 摘要长度范围，超长时在范围内的句子结束处截断
+    SUMMARY_MIN_LENGTH = 150
+
+    SUMMARY_MAX_LENGTH = 400
+
+    SENTENCE_END_MARKS = ('.', '。', '!', '！', '?', '？')
+
+    # 正文中广告、推荐、导航等无用元素的class匹配规则
+    _AD_CLASS_PATTERN = re.compile(r'(ad|advert|promo|推荐|相关|分享|导航|menu|header|footer)', re.I)
+
+    @classmethod
+    def _get_session(cls) -> requests.Session:
+        """
+        获取共享的HTTP会话，复用连接池，避免每次请求重复建立TCP/TLS连接
+        """
+        with cls._request_lock:
+            if cls._session is None:
+                session = requests.Session()
+                session.headers.update(cls.DEFAULT_HEADERS)
+                # 文章链接分布在多个子域名(如fund/stock.eastmoney.com)，按主机缓存的连接池数量留足余量，
+                # 避免连接池被淘汰后重新建立TCP/TLS连接
+                # 连接池内不做重试，由_request经过限速后重试
+                adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                cls._session = session
+        return cls._session
+
+    @classmethod
+    def _ensure_request_interval(cls, url: str) -> None:
+        """
+        按主机限制请求速率，避免被服务器封禁
+
+        每个主机一个令牌桶，允许少量并发请求同时发出，之后每REQUEST_INTERVAL秒补充一个令牌。
+        在锁内预留令牌，锁外休眠，多个线程访问不同网站时不会互相等待。
+        """
+        host = urlparse(url).netloc
+        with cls._request_lock:
+            # 使用单调时钟计时，不受系统时间调整影响
+            current_time = time.monotonic()
+            tokens, updated_time = cls._host_tokens.get(host, (cls.REQUEST_BURST, current_time))
+            if cls.REQUEST_INTERVAL > 0:
+                tokens = min(cls.REQUEST_BURST, tokens + (current_time - updated_time) / cls.REQUEST_INTERVAL)
+            else:
+                tokens = cls.REQUEST_BURST
+            # 令牌不足时记为欠账，后续请求顺延等待
+            tokens -= 1
+            cls._host_tokens[host] = (tokens, current_time)
+        if tokens < 0:
+            time.sleep(-tokens * cls.REQUEST_INTERVAL)
+
+    @classmethod
+    def _request(cls, url: str, headers: Dict[str, str]) -> requests.Response:
+        """
+        按主机限速后以流式方式发起GET请求
+
+        连接错误、超时或RETRY_STATUSES中的状态码最多重试MAX_RETRIES次，
+        每次重试前按REQUEST_INTERVAL指数退避，并重新经过令牌桶，出错的主机不会被连续请求。
+        """
+        for attempt in range(cls.MAX_RETRIES + 1):
+            if attempt:
+                time.sleep(cls.REQUEST_INTERVAL * 2 ** (attempt - 1))
+            cls._ensure_request_interval(url)
+            try:
+                response = cls._get_session().get(url, timeout=10, stream=True, headers=headers)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == cls.MAX_RETRIES:
+                    raise
+                continue
+            if response.status_code not in cls.RETRY_STATUSES or attempt == cls.MAX_RETRIES:
+                return response
+            response.close()
+
+    @classmethod
+    def _http_cache_path(cls, url: str) -> str:
+        """
+        获取URL对应的缓存文件路径
+        """
+        return os.path.join(cls.HTTP_CACHE_DIR, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+
+    @classmethod
+    def _load_http_cache(cls, url: str) -> Optional[Dict[str, Any]]:
+        """
+        读取URL的缓存记录，不存在、已损坏或版本不一致时返回None
+        """
+        try:
+            with open(cls._http_cache_path(url), encoding='utf-8') as f:
+                cache_entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(cache_entry, dict) or cache_entry.get('version') != cls.HTTP_CACHE_VERSION:
+            return None
+        return cache_entry
+
+    @classmethod
+    def _is_cache_fresh(cls, cache_entry: Optional[Dict[str, Any]], ttl: float) -> bool:
+        """
+        判断缓存记录是否仍在有效期内，跨进程比较使用墙上时间
+        """
+        return cache_entry is not None and time.time() - cache_entry.get('cached_at', 0) < ttl
+
+    @classmethod
+    def _conditional_headers(cls, cache_entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """
+        根据缓存记录生成条件请求头，页面未变化时服务器返回304且不带正文
+        """
+        headers = {}
+        if cache_entry:
+            if cache_entry.get('etag'):
+                headers['If-None-Match'] = cache_entry['etag']
+            if cache_entry.get('last_modified'):
+                headers['If-Modified-Since'] = cache_entry['last_modified']
+        return headers
+
+    @classmethod
+    def _save_http_cache(cls, url: str, data: Any, response: Optional[requests.Response] = None) -> None:
+        """
+        保存页面的解析结果、缓存时间以及服务器提供的ETag/Last-Modified
+        """
+        headers = response.headers if response is not None else {}
+        cls._write_http_cache(url, {
+            'version': cls.HTTP_CACHE_VERSION,
+            'url': url,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'cached_at': time.time(),
+            'data': data,
+        })
+
+    @classmethod
+    def _refresh_http_cache(cls, url: str, cache_entry: Dict[str, Any], response: requests.Response) -> None:
+        """
+        页面未变化(304)时沿用缓存的数据，更新缓存时间和服务器返回的新ETag/Last-Modified
+
+        304响应可能不带校验字段，此时保留原有的值。
+        """
+        cls._write_http_cache(url, {
+            **cache_entry,
+            'etag': response.headers.get('ETag') or cache_entry.get('etag'),
+            'last_modified': response.headers.get('Last-Modified') or cache_entry.get('last_modified'),
+            'cached_at': time.time(),
+        })
+
+    @classmethod
+    def _write_http_cache(cls, url: str, cache_entry: Dict[str, Any]) -> None:
+        """
+        将缓存记录写入磁盘
+        """
+        try:
+            os.makedirs(cls.HTTP_CACHE_DIR, exist_ok=True)
+            cache_path = cls._http_cache_path(url)
+            # 先写临时文件再替换，避免并发写入时读到不完整的缓存
+            tmp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(cache_entry, f, ensure_ascii=False)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"写入缓存失败 {url}: {str(e)}")
+
+    @classmethod
+    def prune_http_cache(cls) -> int:
+        """
+        删除超过HTTP_CACHE_MAX_AGE、已损坏或版本不一致的缓存记录以及残留的临时文件，返回删除的文件数
+        """
+        removed = 0
+        now = time.time()
+        try:
+            entries = list(os.scandir(cls.HTTP_CACHE_DIR))
+        except OSError:
+            return 0
+        for entry in entries:
+            if entry.name.endswith('.json'):
+                try:
+                    with open(entry.path, encoding='utf-8') as f:
+                        cache_entry = json.load(f)
+                    expired = (
+                        not isinstance(cache_entry, dict)
+                        or cache_entry.get('version') != cls.HTTP_CACHE_VERSION
+                        or now - cache_entry.get('cached_at', 0) >= cls.HTTP_CACHE_MAX_AGE
+                    )
+                except (OSError, ValueError):
+                    expired = True
+            else:
+                # 写入中断留下的临时文件
+                expired = entry.name.endswith('.tmp')
+            if expired:
+                try:
+                    os.remove(entry.path)
+                    removed += 1
+                except OSError as e:
+                    logger.warning(f"删除缓存失败 {entry.path}: {str(e)}")
+        return removed
+
+    @classmethod
+    def _fetch_links(cls, url: str, limit: int) -> List[Tuple[str, str]]:
+        """
+        流式获取列表页中的链接
+
+        边下载边增量解析，只关注带href的a标签，收集到limit个后立即停止读取，
+        不必下载和解码整个页面。返回(标题, 链接)列表。
+        """
+        cache_entry = cls._load_http_cache(url)
+        if cls._is_cache_fresh(cache_entry, cls.LISTING_CACHE_TTL):
+            logger.info(f"列表页缓存未过期，使用缓存: {url}")
+            return [tuple(link) for link in cache_entry['data']]
+        headers = cls._conditional_headers(cache_entry)
+        with cls._request(url, headers) as response:
+            if response.status_code == 304 and cache_entry is not None:
+                logger.info(f"列表页未变化，使用缓存: {url}")
+                cls._refresh_http_cache(url, cache_entry, response)
+                return [tuple(link) for link in cache_entry['data']]
+            response.raise_for_status()
+            links = cls._parse_links(response, limit)
+            cls._save_http_cache(url, links, response)
+        return links
+
+    @classmethod
+    def _parse_links(cls, response: requests.Response, limit: int) -> List[Tuple[str, str]]:
+        """
+        增量解析响应内容，收集前limit个带href的a标签
+        """
+        links = []
+        parser = etree.HTMLPullParser(events=('end',), tag='a', encoding='utf-8')
+        for chunk in response.iter_content(chunk_size=8192):
+            parser.feed(chunk)
+            if cls._read_link_events(parser, links, limit):
+                return links
+        try:
+            parser.close()
+        except etree.XMLSyntaxError:
+            # 页面为空时无法构建文档，没有可用的链接
+            return links
+        cls._read_link_events(parser, links, limit)
+        return links
+
+    @classmethod
+    def _read_link_events(cls, parser: etree.HTMLPullParser, links: List[Tuple[str, str]], limit: int) -> bool:
+        """
+        读取解析器中已解析完成的a标签并追加到links，达到limit时返回True
+        """
+        for _, element in parser.read_events():
+            href = element.get('href')
+            if href is None:
+                continue
+            title = ''.join(text.strip() for text in element.itertext())
+            links.append((title, href))
+            if len(links) >= limit:
+                return True
+        return False
+
+    @classmethod
+    def _iter_details(cls, candidates: List[Tuple[str, str]], accepted_keys: Set[str]) -> Iterator[Tuple[str, str, str]]:
+        """
+        并发获取候选新闻的详情，按候选顺序依次产出(title, link, detail)
+
+        以滑动窗口提交请求：每产出一条就补充提交，最多排队2倍DETAIL_WORKERS条，
+        前面的新闻在处理时后面的请求已在下载，不必等待整批完成。
+        调用方凑够新闻数量提前结束时，取消尚未开始的请求。
+
+        调用方采用一条新闻后应将其标题归一化键加入accepted_keys。归一化键相同的候选同一时间只请求一条，
+        其余链接暂存为备选：产出的一条未被采用(详情获取失败或内容不可用)时再请求下一条备选，
+        已采用的标题不再请求。
+        """
+        if not candidates:
+            return
+        window = 2 * cls.DETAIL_WORKERS
+        remaining = iter(candidates)
+        pending = deque()
+        # 正在请求的标题键 -> 暂存的同标题备选(title, link)
+        alternates: Dict[str, deque] = {}
+        executor = ThreadPoolExecutor(max_workers=min(cls.DETAIL_WORKERS, len(candidates)))
+        try:
+            while True:
+                # 补充提交到窗口上限，跳过已采用的标题，同标题的候选暂存为备选
+                while len(pending) < window:
+                    candidate = next(remaining, None)
+                    if candidate is None:
+                        break
+                    title, link = candidate
+                    title_key = _title_key(title)
+                    if title_key in accepted_keys:
+                        continue
+                    if title_key in alternates:
+                        alternates[title_key].append((title, link))
+                        continue
+                    alternates[title_key] = deque()
+                    pending.append((title_key, title, link, executor.submit(cls._get_news_detail, link)))
+                if not pending:
+                    break
+                title_key, title, link, future = pending.popleft()
+                yield title, link, future.result()
+                # 调用方未采用这条新闻时，改为请求同标题的下一条备选链接
+                fallbacks = alternates.pop(title_key)
+                if title_key not in accepted_keys and fallbacks:
+                    title, link = fallbacks.popleft()
+                    alternates[title_key] = fallbacks
+                    pending.append((title_key, title, link, executor.submit(cls._get_news_detail, link)))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
     @classmethod
-    def _ensure_request_interval(cls) -> None:
+    def _format_publish_time(cls) -> str:
         """
-        确保请求间隔，避免被服务器封禁
+        格式化当前时间作为新闻的抓取时间
         """
-        current_time = datetime.now().timestamp()
-        elapsed = current_time - cls._last_request_time
-        if elapsed < cls.REQUEST_INTERVAL:
-            import time
-            time.sleep(cls.REQUEST_INTERVAL - elapsed)
-        cls._last_request_time = datetime.now().timestamp()
+        return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
     @classmethod
-    def fetch_eastmoney_news(cls, count: int = 20) -> List[Dict[str, Any]]:
+    def get_finance_news(cls, count: int = 20) -> List[Dict[str, Any]]:
+        """
+        并发获取所有来源的财经新闻
+
+        各来源的抓取主要耗时在网络等待上，使用线程池并发执行，
+        总耗时由各来源耗时之和降为最慢来源的耗时。结果按来源顺序合并。
+        """
+        fetchers = [
+            ('东方财富网新闻', cls.fetch_eastmoney_news),
+            ('新浪财经新闻', cls.fetch_sina_finance_news),
+            ('每日经济新闻', cls.fetch_nbd_news),
+            ('同花顺财经新闻', cls.fetch_10jqka_news),
+        ]
+        # 所有来源共用同一个抓取时间，整批只格式化一次
+        publish_time = cls._format_publish_time()
+        all_news = []
+        with ThreadPoolExecutor(max_workers=len(fetchers)) as executor:
+            futures = [(source, executor.submit(fetch, count, publish_time)) for source, fetch in fetchers]
+            for source, future in futures:
+                try:
+                    news_list = future.result()
+                except Exception as e:
+                    logger.error(f"获取{source}失败: {str(e)}")
+                    continue
+                logger.info(f"{source}获取完成，共 {len(news_list)} 条")
+                all_news.extend(news_list)
+        return all_news
+
+    @classmethod
+    def fetch_eastmoney_news(cls, count: int = 20, publish_time: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         从东方财富网获取财经新闻
         """
         news_list = []
+        # 已采用新闻的标题归一化键，重复或近似重复的标题只采用一次，同标题的其余链接作为备选
+        seen_title_keys = set()
+        # 同一批次的新闻使用相同的抓取时间，避免逐条格式化；由get_finance_news统一传入时不再重复格式化
+        if publish_time is None:
+            publish_time = cls._format_publish_time()
         # 使用多个东方财富网的新闻URL，提高新闻抓取成功率
         urls = [
             "https://finance.eastmoney.com/",
@@ -84,21 +548,14 @@ class NewsFetcher:
         
         for url in urls:
             try:
-                cls._ensure_request_interval()
-                response = requests.get(url, headers=cls.DEFAULT_HEADERS, timeout=10)
-                response.encoding = 'utf-8'  # 确保编码正确
-                response.raise_for_status()
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
                 # 查找新闻列表，使用更通用的选择器
-                news_items = soup.find_all('a', href=True, limit=200)
+                news_items = cls._fetch_links(url, 200)
                 
                 # 调试信息
                 logger.info(f"东方财富网 {url} 找到 {len(news_items)} 个链接")
                 
-                for item in news_items:
-                    title = item.get_text(strip=True)
-                    link = item['href']
+                candidates = []
+                for title, link in news_items:
                     
                     # 过滤条件
                     if len(title) < 10 or len(title) > 150:
@@ -108,18 +565,18 @@ class NewsFetcher:
                             link = f"https://finance.eastmoney.com{link}"
                         else:
                             continue
-                    if any(keyword in link for keyword in ['javascript:', 'mailto:', '#', 'login', 'register']):
+                    if cls._BLOCKED_LINK_PATTERN.search(link):
+                        continue
+                    # 标题不含财经关键词的新闻不再请求详情页
+                    if not cls._FINANCE_KEYWORD_PATTERN.search(title):
                         continue
                     
                     # 调试信息
                     logger.debug(f"处理新闻: {title} - {link}")
-                    
-                    # 获取新闻详情作为摘要
-                    try:
-                        detail = cls._get_news_detail(link)
-                    except Exception as e:
-                        logger.error(f"获取新闻详情失败 {link}: {str(e)}")
-                        continue
+                    candidates.append((title, link))
+                
+                # 并发获取新闻详情作为摘要
+                for title, link, detail in cls._iter_details(candidates, seen_title_keys):
                     
                     # 只使用爬取的摘要，不生成摘要
                     # 确保摘要长度至少20字
@@ -170,20 +627,20 @@ class NewsFetcher:
                             # 如果清理后摘要太短，跳过这条新闻
                             continue
                     
-                    # 检查是否已经添加过相同标题的新闻
-                    if not any(news['title'] == title for news in news_list):
-                        news_list.append({
-                            'title': title,
-                            'link': link,
-                            'source': '东方财富网',
-                            'detail': detail,  # 完整显示摘要，不加...
-                            'publish_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        })
-                        
-                        logger.info(f"添加新闻: {title}")
-                        
-                        if len(news_list) >= count:
-                            break
+                    # 记录已采用的标题，同标题的备选链接不再请求
+                    seen_title_keys.add(_title_key(title))
+                    news_list.append({
+                        'title': title,
+                        'link': link,
+                        'source': '东方财富网',
+                        'detail': detail,  # 完整显示摘要，不加...
+                        'publish_time': publish_time
+                    })
+                    
+                    logger.info(f"添加新闻: {title}")
+                    
+                    if len(news_list) >= count:
+                        break
                 
                 if len(news_list) >= count:
                     break
@@ -194,11 +651,16 @@ class NewsFetcher:
         return news_list
 
     @classmethod
-    def fetch_sina_finance_news(cls, count: int = 20) -> List[Dict[str, Any]]:
+    def fetch_sina_finance_news(cls, count: int = 20, publish_time: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         从新浪财经获取财经新闻
         """
         news_list = []
+        # 已采用新闻的标题归一化键，重复或近似重复的标题只采用一次，同标题的其余链接作为备选
+        seen_title_keys = set()
+        # 同一批次的新闻使用相同的抓取时间，避免逐条格式化；由get_finance_news统一传入时不再重复格式化
+        if publish_time is None:
+            publish_time = cls._format_publish_time()
         # 使用多个新浪财经的新闻URL，提高新闻抓取成功率
         urls = [
             "https://finance.sina.com.cn/",
@@ -208,71 +670,52 @@ class NewsFetcher:
         
         for url in urls:
             try:
-                cls._ensure_request_interval()
-                response = requests.get(url, headers=cls.DEFAULT_HEADERS, timeout=10)
-                response.encoding = 'utf-8'  # 确保编码正确
-                response.raise_for_status()
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
                 # 查找新闻列表，使用更通用的选择器
-                news_items = soup.find_all('a', href=True, limit=200)
+                news_items = cls._fetch_links(url, 200)
                 
                 # 调试信息
                 logger.info(f"新浪财经 {url} 找到 {len(news_items)} 个链接")
                 
-                for item in news_items:
-                    title = item.get_text(strip=True)
-                    link = item['href']
+                candidates = []
+                for title, link in news_items:
                     
                     # 过滤条件
                     if len(title) < 10 or len(title) > 150:
                         continue
                     if not link.startswith('http'):
                         continue
-                    if any(keyword in link for keyword in ['javascript:', 'mailto:', '#', 'login', 'register', 'video']):
+                    if cls._BLOCKED_SINA_LINK_PATTERN.search(link):
                         continue
                     
                     # 过滤出财经相关新闻
-                    finance_keywords = ['经济', '股票', '基金', '金融', '市场', '投资', '理财', 'A股', '港股', '美股', '债券', 'ETF']
-                    if any(keyword in title for keyword in finance_keywords):
-                        # 只使用爬取的摘要，不生成
-                        try:
-                            detail = cls._get_news_detail(link)
-                        except Exception as e:
-                            logger.error(f"获取新浪财经新闻详情失败 {link}: {str(e)}")
-                            continue
-                        
-                        # 确保摘要内容是真实爬取的，不生成
-                        if not detail or len(detail) < 20:  # 降低长度要求，确保使用真实内容
-                            # 如果完全没有爬取到内容，跳过这条新闻
-                            continue
-                        
-                        # 确保摘要长度在150-400字之间
-                        if len(detail) > 400:
-                            # 截取到400字并确保句子完整
-                            detail = detail[:400]
-                            # 尝试在句子结束处截断
-                            for i in range(len(detail)-1, 150, -1):
-                                if detail[i] in ['.', '。', '!', '！', '?', '？']:
-                                    detail = detail[:i+1]
-                                    break
-                            # 如果没有找到合适的结束符，直接截取400字
-                            detail = detail[:400]
-                        
-                        # 检查是否已经添加过相同标题的新闻
-                        if not any(news['title'] == title for news in news_list):
-                            news_list.append({
-                                'title': title,
-                                'link': link,
-                                'source': '新浪财经',
-                                'detail': detail,  # 完整显示摘要，不加...
-                                'publish_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                            })
-                            
-                            logger.info(f"添加新闻: {title}")
-                            
-                            if len(news_list) >= count:
-                                break
+                    if cls._FINANCE_KEYWORD_PATTERN.search(title):
+                        candidates.append((title, link))
+                
+                # 只使用爬取的摘要，不生成
+                for title, link, detail in cls._iter_details(candidates, seen_title_keys):
+                    
+                    # 确保摘要内容是真实爬取的，不生成
+                    if not detail or len(detail) < 20:  # 降低长度要求，确保使用真实内容
+                        # 如果完全没有爬取到内容，跳过这条新闻
+                        continue
+                    
+                    # 确保摘要长度在150-400字之间
+                    detail = cls._truncate_summary(detail)
+                    
+                    # 记录已采用的标题，同标题的备选链接不再请求
+                    seen_title_keys.add(_title_key(title))
+                    news_list.append({
+                        'title': title,
+                        'link': link,
+                        'source': '新浪财经',
+                        'detail': detail,  # 完整显示摘要，不加...
+                        'publish_time': publish_time
+                    })
+                    
+                    logger.info(f"添加新闻: {title}")
+                    
+                    if len(news_list) >= count:
+                        break
                 
                 if len(news_list) >= count:
                     break
@@ -283,147 +726,116 @@ class NewsFetcher:
         return news_list
 
     @classmethod
-    def _generate_enhanced_summary(cls, title: str) -> str:
+    def _truncate_summary(cls, text: str) -> str:
         """
-        生成增强型摘要，确保长度在150到400字之间，且与标题内容不同
+        将超过400字的摘要截断到400字以内，尽量在第150字之后的句子结束处截断
+
+        每个结束符用一次str.rfind在截取窗口内查找，代替逐字符向前扫描。
         """
-        # 不再以标题作为基础，而是直接生成与标题相关但不同的摘要
-        
-        # 根据不同主题生成扩展内容
-        enhanced_content = ""
-        
-        if 'REITs' in title or '保租房' in title:
-            enhanced_content = "近期，公募REITs市场表现活跃，二级市场超跌反弹，保租房板块领涨，多只REITs产品涨幅显著。同时，发行市场保持热度，多只新REITs产品正在筹备中。分析人士指出，REITs作为资产配置的重要工具，具有稳定现金流和长期增值潜力，适合长期投资。"
-        elif '港股' in title:
-            enhanced_content = "多家港股基金近期密集大幅提前结募，反映了市场对港股市场的看好。分析人士认为，随着内地与香港金融市场互联互通不断深化，港股市场的投资价值日益凸显。在全球经济复苏的背景下，港股市场的优质企业有望迎来估值修复和业绩增长的双重利好。"
-        elif '基金公司' in title or '股权' in title:
-            enhanced_content = "基金行业的股权变动和增资引新成为市场关注焦点。长安基金6.67%股权再转让，华润元大基金拟增资引入新股东，这些变动反映了基金行业的整合趋势。业内人士指出，基金公司通过股权调整和增资扩股，可以增强资本实力，提升投资管理能力。"
-        elif 'A股' in title or '股市' in title:
-            enhanced_content = "A股市场近期表现活跃，市场做多情绪浓厚。基金经理们纷纷筛选2026年的'机遇清单'，看好高景气行业的投资机会。分析人士认为，随着经济基本面的逐步改善和政策支持力度的加大，A股市场有望迎来更多投资机会。"
-        elif 'ETF' in title:
-            # 根据标题中的具体ETF类型生成不同的摘要
-            if '规模' in title or '净流入' in title:
-                enhanced_content = "近期ETF市场规模持续扩大，多只ETF产品获得资金净流入。其中，中证500ETF、沪深300ETF等宽基ETF表现尤为突出，单日净流入金额超过数十亿元。ETF作为指数化投资工具，具有交易便捷、成本低、透明度高等优势，受到投资者的青睐。"
-            elif '行业ETF' in title or '风向标' in title:
-                enhanced_content = "行业ETF市场近期表现活跃，不同行业ETF呈现差异化走势。有色金属ETF、化工ETF等周期类ETF涨幅显著，而香港证券ETF、港股通ETF等跨境ETF交投活跃。投资者可通过行业ETF把握不同行业的投资机会。"
-            elif '宽基' in title or '全景图' in title:
-                enhanced_content = "宽基ETF市场表现分化，双创ETF领跑业绩，沪深300ETF仍是资金青睐的'吸金王'。截至目前，ETF总规模年内增长显著，逼近万亿元大关。宽基ETF为投资者提供了便捷的市场整体布局工具。"
-            else:
-                enhanced_content = "ETF市场近期迎来爆发式增长，多只ETF产品涨幅显著。基金公司火速解读认为，春季躁动行情有望延续，险资入场或成为市场上涨的加分项。ETF作为指数化投资工具，具有交易便捷、成本低、透明度高等优势，受到投资者的青睐。"
-        elif '消费' in title:
-            enhanced_content = "消费板块近期表现强势，成为市场关注的焦点。分析人士认为，随着居民收入水平的提高和消费升级的推进，消费行业有望保持稳定增长。投资者可关注白酒、家电、食品饮料等传统消费行业，以及电商、新能源汽车等新兴消费领域。"
-        elif '医药' in title:
-            enhanced_content = "医药板块近期表现活跃，创新药、医疗器械等细分领域涨幅显著。随着人口老龄化加剧和医疗需求的增长，医药行业长期投资价值凸显。投资者可关注创新能力强、研发投入高的医药企业，以及受益于政策支持的医药细分领域。"
-        elif '新能源' in title or '光伏' in title or '风电' in title:
-            enhanced_content = "新能源板块近期表现强势，光伏、风电等细分领域涨幅显著。随着全球能源转型的推进，新能源行业迎来了快速发展的机遇。分析人士认为，新能源行业具有广阔的发展空间，投资者可关注光伏、风电、储能等细分领域的投资机会。"
-        elif '科技' in title or '人工智能' in title:
-            enhanced_content = "科技板块近期表现活跃，人工智能、芯片等细分领域涨幅显著。随着科技的不断进步和应用场景的拓展，科技行业长期投资价值凸显。投资者可关注人工智能、芯片、云计算等前沿科技领域，以及受益于数字化转型的传统行业。"
-        elif '芯片' in title or '半导体' in title:
-            enhanced_content = "芯片板块近期表现活跃，受到市场广泛关注。随着全球芯片短缺问题的缓解和半导体产业的升级，芯片行业迎来了新的发展机遇。分析人士认为，芯片作为科技产业的核心部件，其市场需求将持续增长，尤其是在人工智能、5G、新能源汽车等领域。"
-        elif '云计算' in title or '云服务' in title:
-            enhanced_content = "云计算板块近期表现强劲，市场关注度较高。随着数字化转型的推进和企业上云需求的增加，云计算行业有望保持快速增长。分析人士认为，云计算作为数字经济的基础设施，其市场规模将持续扩大，尤其是在人工智能、大数据等领域的应用不断深化。"
-        elif '大数据' in title or '数据要素' in title:
-            enhanced_content = "大数据板块近期受到市场关注，数据要素市场化改革的推进为行业带来了新的发展机遇。分析人士认为，随着数据成为重要的生产要素，大数据产业的市场规模将持续扩大，尤其是在数据采集、存储、分析和应用等环节。"
-        elif '金融科技' in title or '数字金融' in title:
-            enhanced_content = "金融科技板块近期表现活跃，数字金融的发展为金融行业带来了新的变革。分析人士认为，随着金融科技的不断创新和应用，金融服务的效率和质量将得到提升，同时也将带来新的投资机会。"
-        elif '汽车' in title or '新能源汽车' in title:
-            enhanced_content = "汽车板块近期表现强势，尤其是新能源汽车领域。随着全球汽车产业的电动化转型，新能源汽车市场规模持续扩大，相关产业链企业受益明显。分析人士认为，新能源汽车行业的发展将带动电池、电机、电控等上下游产业链的发展。"
-        elif '游戏' in title or '电竞' in title:
-            enhanced_content = "游戏板块近期表现活跃，电竞产业的快速发展为行业带来了新的增长动力。分析人士认为，随着游戏行业的内容创新和技术升级，以及电竞市场的不断扩大，游戏行业的市场规模将持续增长。"
-        elif '高股息' in title or '红利' in title:
-            enhanced_content = "高股息板块近期受到市场关注，尤其是在市场波动较大的情况下，高股息股票的防御性优势凸显。分析人士认为，高股息股票具有稳定的现金流和良好的分红能力，适合长期投资和价值投资。"
-        elif '基金公司' in title or '股权' in title or '转让' in title:
-            enhanced_content = "基金行业的股权变动和增资引新成为市场关注焦点。近期多家基金公司发布股权变动公告，这些变动反映了基金行业的整合趋势。业内人士指出，基金公司通过股权调整和增资扩股，可以增强资本实力，提升投资管理能力。"
-        elif '清盘' in title or '规模' in title or '迷你' in title:
-            enhanced_content = "近期多只基金发布清盘预警，部分绩优基金也遭遇规模'迷你'的尴尬。分析人士认为，基金规模的变化受到多种因素影响，包括市场环境、投资者偏好和基金经理的投资业绩等。投资者在选择基金时，应综合考虑基金的业绩表现、基金经理的管理能力和基金公司的整体实力。"
-        elif 'FOF' in title or '基金中基金' in title:
-            enhanced_content = "FOF基金近期受到市场关注，部分FOF基金一日结募，反映了投资者对FOF产品的认可。FOF基金通过分散投资于多只基金，降低了单一基金的风险，适合风险偏好较低的投资者。分析人士认为，FOF基金将成为未来基金市场的重要发展方向。"
-        elif '葛兰' in title or '周蔚文' in title or '基金经理' in title:
-            enhanced_content = "明星基金经理的动向受到市场广泛关注。近期葛兰、周蔚文等知名基金经理管理的基金出现新动态，这些变化可能反映了基金经理对市场的判断和投资策略的调整。投资者在关注明星基金经理的同时，也应理性看待基金的长期业绩表现。"
-        elif '费率' in title or '改革' in title or '让利' in title:
-            enhanced_content = "基金费率改革是近期基金市场的重要话题。公募基金费率改革的实施，将为投资者带来实实在在的好处，每年让利超500亿元。分析人士认为，费率改革将推动基金行业向更规范、更透明的方向发展，有利于提升投资者的获得感。"
-        elif '开门红' in title or '涨' in title or '收益率' in title:
-            enhanced_content = "近期A股市场喜迎开门红，基金市场也表现活跃，多只基金涨幅显著。市场做多情绪浓厚，投资者对2026年的市场表现充满期待。分析人士认为，随着经济基本面的逐步改善和政策支持力度的加大，基金市场有望迎来更多投资机会。"
-        else:
-            # 为不同类型的新闻生成不同的默认摘要，避免重复
-            if 'ETF' in title:
-                enhanced_content = "ETF市场近期表现活跃，多只ETF产品涨幅显著。ETF作为指数化投资工具，具有交易便捷、成本低、透明度高等优势，受到投资者的青睐。近期ETF市场规模持续扩大，反映了投资者对指数化投资的认可。"
-            elif '基金' in title:
-                enhanced_content = "近期基金市场表现活跃，各类型基金呈现不同的表现态势。投资者应根据自身的风险偏好和投资目标，选择适合自己的基金产品。在市场波动较大的情况下，分散投资、长期持有是较为稳健的投资方式。"
-            else:
-                enhanced_content = "近期，金融市场表现活跃，各板块轮动明显。基金市场也受到影响，相关基金产品表现各异。投资者应保持理性，关注市场动态，根据自身风险偏好制定合理的投资策略。"
-        
-        # 确保摘要长度在150到400字之间
-        if len(enhanced_content) < 150:
-            # 继续添加内容，确保长度足够
-            enhanced_content += " 市场分析人士指出，当前市场环境下，投资者应关注政策面的变化和经济基本面的改善，把握结构性投资机会。同时，要注意控制风险，避免盲目跟风和追涨杀跌。"
-        
-        # 如果内容过长，截取到400字并确保句子完整
-        if len(enhanced_content) > 400:
-            enhanced_content = enhanced_content[:400]
-            # 尝试在句子结束处截断
-            for i in range(len(enhanced_content)-1, 150, -1):
-                if enhanced_content[i] in ['.', '。', '!', '！', '?', '？']:
-                    enhanced_content = enhanced_content[:i+1]
-                    break
-            # 如果没有找到合适的结束符，直接截取400字
-            enhanced_content = enhanced_content[:400]
-        
-        return enhanced_content
-    
+        if len(text) <= cls.SUMMARY_MAX_LENGTH:
+            return text
+        text = text[:cls.SUMMARY_MAX_LENGTH]
+        end = max(text.rfind(mark, cls.SUMMARY_MIN_LENGTH + 1) for mark in cls.SENTENCE_END_MARKS)
+        # 没有找到合适的结束符时直接保留400字
+        return text[:end + 1] if end != -1 else text
+
+    @classmethod
+    def _read_body(cls, response: requests.Response, max_bytes: int) -> bytes:
+        """
+        流式读取响应内容，最多读取max_bytes字节(解压后)，超出部分不再下载
+        """
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=16384):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= max_bytes:
+                break
+        return b''.join(chunks)[:max_bytes]
+
+    @classmethod
+    def _detect_meta_charset(cls, body: bytes) -> Optional[str]:
+        """
+        从页面开头的meta标签中读取声明的编码，未声明或编码名无法识别时返回None
+        """
+        match = cls._META_CHARSET_PATTERN.search(body, 0, 4096)
+        if match is None:
+            return None
+        encoding = match.group(1).decode('ascii')
+        try:
+            codecs.lookup(encoding)
+        except LookupError:
+            return None
+        return encoding
+
+    @classmethod
+    def _parse_document(cls, response: requests.Response, body: bytes) -> etree._Element:
+        """
+        使用lxml解析详情页
+
+        编码依次取响应头声明、页面meta声明，都没有时按UTF-8解码。
+        响应头未带charset时requests报告ISO-8859-1，此时视为未声明。
+        """
+        encoding = None if response.encoding in (None, 'ISO-8859-1') else response.encoding
+        if encoding is None:
+            encoding = cls._detect_meta_charset(body) or cls.DEFAULT_ENCODING
+        try:
+            return lxml_html.document_fromstring(body, parser=lxml_html.HTMLParser(encoding=encoding))
+        except etree.ParserError:
+            # 页面为空时返回空文档，按没有正文处理
+            return lxml_html.document_fromstring('<html></html>')
+
+    @classmethod
+    def _extract_text(cls, element: etree._Element) -> str:
+        """
+        移除正文中的脚本、样式和广告元素后，按行拼接其中的文本
+        """
+        etree.strip_elements(element, 'script', 'style', with_tail=False)
+        ads = [
+            child for child in element.iterdescendants('div', 'span')
+            if cls._AD_CLASS_PATTERN.search(child.get('class', ''))
+        ]
+        for ad in ads:
+            ad.drop_tree()
+        return '\n'.join(text for text in (text.strip() for text in element.itertext()) if text)
+
     @classmethod
     def _get_news_detail(cls, url: str) -> str:
         """
         获取新闻详情，并控制在150-400字之间
         """
         try:
-            cls._ensure_request_interval()
-            response = requests.get(url, headers=cls.DEFAULT_HEADERS, timeout=10)
-            response.raise_for_status()
-            
-            # 尝试自动检测编码
-            if response.encoding == 'ISO-8859-1':
-                # 尝试使用utf-8编码
-                try:
-                    response.encoding = 'utf-8'
-                except:
-                    # 如果失败，尝试使用gbk编码
-                    response.encoding = 'gbk'
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
+            cache_entry = cls._load_http_cache(url)
+            if cache_entry is not None:
+                ttl = cls.DETAIL_CACHE_TTL if cache_entry['data'] else cls.NEGATIVE_CACHE_TTL
+                if cls._is_cache_fresh(cache_entry, ttl):
+                    return cache_entry['data']
+            headers = cls._conditional_headers(cache_entry)
+            with cls._request(url, headers) as response:
+                if response.status_code == 304 and cache_entry is not None:
+                    cls._refresh_http_cache(url, cache_entry, response)
+                    return cache_entry['data']
+                response.raise_for_status()
+                body = cls._read_body(response, cls.DETAIL_MAX_BYTES)
             
+            document = cls._parse_document(response, body)
+
             # 提取正文内容
             content = ''
-            # 尝试多种常见的正文容器类名，添加更多针对东方财富网的选择器
-            content_selectors = [
-                'div.art_context_box',  # 东方财富网
-                'div#ContentBody',  # 东方财富网另一种格式
-                'div.article-content',  # 东方财富网
-                'div.article',  # 新浪财经
-                'div.content',
-                'div.main-content',
-                'article',
-                'div.newsContent',  # 其他网站
-                'div.post-content',  # 其他网站
-            ]
-            
-            for selector in content_selectors:
-                content_elem = soup.select_one(selector)
-                if content_elem:
-                    # 移除广告和无用元素
-                    for ad in content_elem.find_all(['script', 'style', 'div', 'span'], class_=re.compile(r'(ad|advert|promo|推荐|相关|分享|导航|menu|header|footer)', re.I)):
-                        ad.decompose()
-                    content = content_elem.get_text(strip=True, separator='\n')
+            for matcher in cls._CONTENT_MATCHERS:
+                matches = matcher(document)
+                if matches:
+                    content = cls._extract_text(matches[0])
                     # 过滤掉太短的内容
                     if len(content) > 50:
                         break
-            
+
             # 如果没有找到正文或内容太短，生成与标题相关的摘要
             if not content or len(content) < 100:
                 # 基于标题生成相关摘要
-                title = soup.find('title')
-                if title:
-                    title_text = title.get_text(strip=True)
+                title_text = document.findtext('.//title')
+                if title_text is not None:
+                    title_text = title_text.strip()
                     # 简单的摘要生成逻辑，基于标题关键词
                     if '机器人' in title_text:
                         content = "近日，知名投资者葛卫东布局机器人领域，引发市场关注。机器人行业作为新兴产业，具有广阔的发展前景，相关技术的突破和应用场景的拓展为行业带来新的机遇。分析人士认为，随着人工智能技术的不断进步，机器人行业有望迎来快速发展期。"
@@ -439,175 +851,148 @@ class NewsFetcher:
             # 移除多余的换行和空格
             content = ' '.join(content.split())
             
-            # 控制摘要长度在150-400字之间
-            if len(content) < 150:
-                # 如果内容太短，返回原内容
-                return content
-            elif len(content) > 400:
-                # 如果内容太长，截取400字并确保句子完整
-                content = content[:400]
-                # 尝试在句子结束处截断
-                for i in range(len(content)-1, 150, -1):
-                    if content[i] in ['.', '。', '!', '！', '?', '？']:
-                        content = content[:i+1]
-                        break
-                # 如果没有找到合适的结束符，直接截取400字
-                return content[:400]
-            else:
-                # 内容长度合适，直接返回
-                return content
+            # 控制摘要长度在150-400字之间，内容太短时返回原内容
+            content = cls._truncate_summary(content)
+            
+            cls._save_http_cache(url, content, response)
+            return content
+        except requests.HTTPError as e:
+            logger.error(f"获取新闻详情失败 {url}: {str(e)}")
+            if e.response is not None and e.response.status_code in cls.NEGATIVE_CACHE_STATUSES:
+                cls._save_http_cache(url, "", e.response)
+            return ""
         except Exception as e:
             logger.error(f"获取新闻详情失败 {url}: {str(e)}")
             return ""
 
     @classmethod
-    def fetch_nbd_news(cls, count: int = 20) -> List[Dict[str, Any]]:
+    def fetch_nbd_news(cls, count: int = 20, publish_time: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         从每日经济新闻基金频道获取新闻
         URL: https://money.nbd.com.cn/columns/440/
         使用更通用的选择器
         """
         news_list = []
+        # 已采用新闻的标题归一化键，重复或近似重复的标题只采用一次，同标题的其余链接作为备选
+        seen_title_keys = set()
+        # 同一批次的新闻使用相同的抓取时间，避免逐条格式化；由get_finance_news统一传入时不再重复格式化
+        if publish_time is None:
+            publish_time = cls._format_publish_time()
         try:
             url = "https://money.nbd.com.cn/columns/440/"
-            cls._ensure_request_interval()
-            response = requests.get(url, headers=cls.DEFAULT_HEADERS, timeout=10)
-            response.encoding = 'utf-8'
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
             # 使用更通用的选择器，查找所有a标签
-            all_links = soup.find_all('a', href=True, limit=100)
-            for link in all_links:
-                title = link.get_text(strip=True)
-                href = link['href']
+            all_links = cls._fetch_links(url, 100)
+            candidates = []
+            for title, href in all_links:
                 
                 # 过滤条件
                 if len(title) < 15 or len(title) > 150:  # 放宽标题长度要求
                     continue
                 if not href.startswith('http'):
                     continue
-                if 'javascript:' in href or '#' in href:
+                if cls._BLOCKED_FUND_LINK_PATTERN.search(href):
                     continue
                 
                 # 只保留包含基金相关关键词的新闻
-                fund_keywords = ['基金', 'ETF', '股票', '金融', '市场', '投资', '理财']
-                if any(keyword in title for keyword in fund_keywords):
-                    # 只使用爬取的摘要，不生成
-                    detail = cls._get_news_detail(href)
-                    
-                    # 确保摘要内容是真实爬取的，不生成
-                    if not detail or len(detail) < 50:  # 降低长度要求，确保使用真实内容
-                        # 如果爬取到的内容太短，使用标题加上部分正文（如果有）
-                        if detail:
-                            # 使用爬取到的全部内容
-                            pass
-                        else:
-                            # 如果完全没有爬取到内容，跳过这条新闻
-                            continue
-                    
-                    # 确保摘要长度在150到400字之间
-                    if len(detail) > 400:
-                        # 截取到400字并确保句子完整
-                        detail = detail[:400]
-                        # 尝试在句子结束处截断
-                        for i in range(len(detail)-1, 150, -1):
-                            if detail[i] in ['.', '。', '!', '！', '?', '？']:
-                                detail = detail[:i+1]
-                                break
-                        # 如果没有找到合适的结束符，直接截取400字
-                        detail = detail[:400]
-                    
-                    # 检查是否已经添加过相同标题的新闻
-                    if not any(news['title'] == title for news in news_list):
-                        news_list.append({
-                            'title': title,
-                            'link': href,
-                            'source': '每日经济新闻',
-                            'detail': detail,  # 完整显示摘要，不加...
-                            'publish_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        })
-                        
-                        logger.info(f"添加新闻: {title}")
-                        
-                        if len(news_list) >= count:
-                            break
+                if cls._FUND_KEYWORD_PATTERN.search(title):
+                    candidates.append((title, href))
+            
+            # 只使用爬取的摘要，不生成
+            for title, href, detail in cls._iter_details(candidates, seen_title_keys):
+                
+                # 确保摘要内容是真实爬取的，不生成
+                if not detail or len(detail) < 50:  # 降低长度要求，确保使用真实内容
+                    # 如果爬取到的内容太短，使用标题加上部分正文（如果有）
+                    if detail:
+                        # 使用爬取到的全部内容
+                        pass
+                    else:
+                        # 如果完全没有爬取到内容，跳过这条新闻
+                        continue
+                
+                # 确保摘要长度在150到400字之间
+                detail = cls._truncate_summary(detail)
+                
+                # 记录已采用的标题，同标题的备选链接不再请求
+                seen_title_keys.add(_title_key(title))
+                news_list.append({
+                    'title': title,
+                    'link': href,
+                    'source': '每日经济新闻',
+                    'detail': detail,  # 完整显示摘要，不加...
+                    'publish_time': publish_time
+                })
+                
+                logger.info(f"添加新闻: {title}")
+                
+                if len(news_list) >= count:
+                    break
         except Exception as e:
             logger.error(f"获取每日经济新闻失败: {str(e)}")
         return news_list
     
     @classmethod
-    def fetch_10jqka_news(cls, count: int = 20) -> List[Dict[str, Any]]:
+    def fetch_10jqka_news(cls, count: int = 20, publish_time: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         从同花顺财经基金频道获取新闻
         URL: https://m.10jqka.com.cn/fund/jjzx_list/
         使用更通用的选择器
         """
         news_list = []
+        # 已采用新闻的标题归一化键，重复或近似重复的标题只采用一次，同标题的其余链接作为备选
+        seen_title_keys = set()
+        # 同一批次的新闻使用相同的抓取时间，避免逐条格式化；由get_finance_news统一传入时不再重复格式化
+        if publish_time is None:
+            publish_time = cls._format_publish_time()
         try:
             url = "https://m.10jqka.com.cn/fund/jjzx_list/"
-            cls._ensure_request_interval()
-            response = requests.get(url, headers=cls.DEFAULT_HEADERS, timeout=10)
-            response.encoding = 'utf-8'
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
             # 使用更通用的选择器，查找所有a标签
-            all_links = soup.find_all('a', href=True, limit=100)
-            for link in all_links:
-                title = link.get_text(strip=True)
-                href = link['href']
+            all_links = cls._fetch_links(url, 100)
+            candidates = []
+            for title, href in all_links:
                 
                 # 过滤条件
                 if len(title) < 15 or len(title) > 150:
                     continue
                 if not href.startswith('http'):
                     continue
-                if 'javascript:' in href or '#' in href:
+                if cls._BLOCKED_FUND_LINK_PATTERN.search(href):
                     continue
                 
                 # 只保留包含基金相关关键词的新闻
-                fund_keywords = ['基金', 'ETF', '股票', '金融', '市场', '投资', '理财']
-                if any(keyword in title for keyword in fund_keywords):
-                    # 只使用爬取的摘要，不生成
-                    detail = cls._get_news_detail(href)
-                    
-                    # 确保摘要内容是真实爬取的，不生成
-                    if not detail or len(detail) < 50:  # 降低长度要求，确保使用真实内容
-                        # 如果爬取到的内容太短，使用标题加上部分正文（如果有）
-                        if detail:
-                            # 使用爬取到的全部内容
-                            pass
-                        else:
-                            # 如果完全没有爬取到内容，跳过这条新闻
-                            continue
-                    
-                    # 确保摘要长度在150到400字之间
-                    if len(detail) > 400:
-                        # 截取到400字并确保句子完整
-                        detail = detail[:400]
-                        # 尝试在句子结束处截断
-                        for i in range(len(detail)-1, 150, -1):
-                            if detail[i] in ['.', '。', '!', '！', '?', '？']:
-                                detail = detail[:i+1]
-                                break
-                        # 如果没有找到合适的结束符，直接截取400字
-                        detail = detail[:400]
-                    
-                    # 检查是否已经添加过相同标题的新闻
-                    if not any(news['title'] == title for news in news_list):
-                        news_list.append({
-                            'title': title,
-                            'link': href,
-                            'source': '同花顺财经',
-                            'detail': detail,  # 完整显示摘要，不加...
-                            'publish_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        })
-                        
-                        logger.info(f"添加新闻: {title}")
-                        
-                        if len(news_list) >= count:
-                            break
+                if cls._FUND_KEYWORD_PATTERN.search(title):
+                    candidates.append((title, href))
+            
+            # 只使用爬取的摘要，不生成
+            for title, href, detail in cls._iter_details(candidates, seen_title_keys):
+                
+                # 确保摘要内容是真实爬取的，不生成
+                if not detail or len(detail) < 50:  # 降低长度要求，确保使用真实内容
+                    # 如果爬取到的内容太短，使用标题加上部分正文（如果有）
+                    if detail:
+                        # 使用爬取到的全部内容
+                        pass
+                    else:
+                        # 如果完全没有爬取到内容，跳过这条新闻
+                        continue
+                
+                # 确保摘要长度在150到400字之间
+                detail = cls._truncate_summary(detail)
+                
+                # 记录已采用的标题，同标题的备选链接不再请求
+                seen_title_keys.add(_title_key(title))
+                news_list.append({
+                    'title': title,
+                    'link': href,
+                    'source': '同花顺财经',
+                    'detail': detail,  # 完整显示摘要，不加...
+                    'publish_time': publish_time
+                })
+                
+                logger.info(f"添加新闻: {title}")
+                
+                if len(news_list) >= count:
+                    break
         except Exception as e:
             logger.error(f"获取同花顺财经新闻失败: {str(e)}")
         return news_list
@@ -626,36 +1011,80 @@ class NewsProcessor:
 
     # 行业分类关键词
     INDUSTRY_KEYWORDS = {
-        '科技': ['科技', '人工智能', 'AI', '芯片', '半导体', '互联网', '云计算', '大数据', '5G', '物联网', '区块链'],
-        '金融': ['金融', '银行', '保险', '证券', '基金', 'ETF', '债券', '期货', '外汇', '数字货币'],
-        '医药': ['医药', '医疗', '健康', '生物', '制药', '疫苗', '医院', '医疗器械'],
-        '消费': ['消费', '零售', '食品', '饮料', '服装', '家电', '餐饮', '旅游', '娱乐'],
-        '新能源': ['新能源', '光伏', '风电', '核电', '水电', '太阳能', '氢能', '储能'],
-        '汽车': ['汽车', '新能源汽车', '电动车', '自动驾驶', '汽车零部件'],
-        '地产': ['房地产', '房产', '地产', '物业', '建筑', '建材'],
-        '农业': ['农业', '农村', '农民', '农产品', '养殖', '种植'],
-        '化工': ['化工', '化学', '材料', '塑料', '橡胶', '涂料', '化肥'],
-        '有色': ['有色', '金属', '铜', '铝', '锌', '锂', '镍', '钴'],
-        '钢铁': ['钢铁', '铁矿', '钢材', '钢企'],
-        '煤炭': ['煤炭', '焦炭', '煤化工'],
-        '电力': ['电力', '电网', '火电', '水电', '核电', '风电', '光伏'],
-        '通信': ['通信', '电信', '运营商', '基站', '光缆', '卫星'],
-        '传媒': ['传媒', '媒体', '出版', '广告', '电影', '电视', '游戏', '电竞'],
-        '教育': ['教育', '培训', '学校', '学习', '考试'],
-        '军工': ['军工', '国防', '军事', '武器', '装备'],
-        '环保': ['环保', '环境', '绿色', '节能', '减排', '污染'],
-        '交运': ['交通', '运输', '物流', '航运', '航空', '铁路', '公路'],
-        '公用': ['公用事业', '水务', '燃气', '热力', '公共服务'],
-        '纺织': ['纺织', '服装', '面料', '纱线', '印染'],
-        '轻工': ['轻工', '造纸', '包装', '家居', '家具', '文具'],
-        '机械': ['机械', '装备', '制造', '机床', '机器人', '自动化'],
-        '电子': ['电子', '元件', '器件', '电路', '芯片', '半导体'],
-        '计算机': ['计算机', '软件', '硬件', '系统', '编程', '算法'],
-        '建筑': ['建筑', '工程', '施工', '设计', '房地产开发'],
-        '建材': ['建材', '水泥', '玻璃', '陶瓷', '钢材', '木材'],
-        '造纸': ['造纸', '纸浆', '纸张', '包装纸', '文化纸']
+        '科技': ('科技', '人工智能', 'AI', '芯片', '半导体', '互联网', '云计算', '大数据', '5G', '物联网', '区块链'),
+        '金融': ('金融', '银行', '保险', '证券', '基金', 'ETF', '债券', '期货', '外汇', '数字货币'),
+        '医药': ('医药', '医疗', '健康', '生物', '制药', '疫苗', '医院', '医疗器械'),
+        '消费': ('消费', '零售', '食品', '饮料', '服装', '家电', '餐饮', '旅游', '娱乐'),
+        '新能源': ('新能源', '光伏', '风电', '核电', '水电', '太阳能', '氢能', '储能'),
+        '汽车': ('汽车', '新能源汽车', '电动车', '自动驾驶', '汽车零部件'),
+        '地产': ('房地产', '房产', '地产', '物业', '建筑', '建材'),
+        '农业': ('农业', '农村', '农民', '农产品', '养殖', '种植'),
+        '化工': ('化工', '化学', '材料', '塑料', '橡胶', '涂料', '化肥'),
+        '有色': ('有色', '金属', '铜', '铝', '锌', '锂', '镍', '钴'),
+        '钢铁': ('钢铁', '铁矿', '钢材', '钢企'),
+        '煤炭': ('煤炭', '焦炭', '煤化工'),
+        '电力': ('电力', '电网', '火电', '水电', '核电', '风电', '光伏'),
+        '通信': ('通信', '电信', '运营商', '基站', '光缆', '卫星'),
+        '传媒': ('传媒', '媒体', '出版', '广告', '电影', '电视', '游戏', '电竞'),
+        '教育': ('教育', '培训', '学校', '学习', '考试'),
+        '军工': ('军工', '国防', '军事', '武器', '装备'),
+        '环保': ('环保', '环境', '绿色', '节能', '减排', '污染'),
+        '交运': ('交通', '运输', '物流', '航运', '航空', '铁路', '公路'),
+        '公用': ('公用事业', '水务', '燃气', '热力', '公共服务'),
+        '纺织': ('纺织', '服装', '面料', '纱线', '印染'),
+        '轻工': ('轻工', '造纸', '包装', '家居', '家具', '文具'),
+        '机械': ('机械', '装备', '制造', '机床', '机器人', '自动化'),
+        '电子': ('电子', '元件', '器件', '电路', '芯片', '半导体'),
+        '计算机': ('计算机', '软件', '硬件', '系统', '编程', '算法'),
+        '建筑': ('建筑', '工程', '施工', '设计', '房地产开发'),
+        '建材': ('建材', '水泥', '玻璃', '陶瓷', '钢材', '木材'),
+        '造纸': ('造纸', '纸浆', '纸张', '包装纸', '文化纸')
     }
 
+    _INDUSTRY_KEYWORD_INDEX = _build_keyword_index(INDUSTRY_KEYWORDS)
+
+    # 基金相关关键词
+    FUND_KEYWORDS = ('基金', 'ETF', '股票', '金融', '市场', '投资', '理财')
+
+    # 市场影响关键词
+    MARKET_IMPACT_KEYWORDS = ('央行', '政策', '利率', '汇率', '关税', '外贸', '经济数据', 'GDP', 'CPI', 'PPI', 'PMI', '就业', '通胀', '通缩', '流动性', '资金面', '市场情绪', '风险偏好', '估值', '泡沫', '崩盘', '牛市', '熊市', '震荡', '反弹', '回调', '调整', '上涨', '下跌', '涨停', '跌停')
+
+    # 财经相关关键词，用于基金相关新闻不足时补充
+    FINANCE_KEYWORDS = ('财经', '经济', '金融', '市场', '投资', '理财', '股票', '基金', 'ETF', '债券', '期货', '外汇', '保险', '银行', '证券', '地产', '科技', '医药', '消费', '新能源', '汽车', '有色', '钢铁', '煤炭', '电力', '通信', '传媒', '教育', '军工', '环保', '交运', '公用')
+
+    _FUND_KEYWORD_PATTERN = _compile_keywords(FUND_KEYWORDS)
+
+    _MARKET_IMPACT_KEYWORD_PATTERN = _compile_keywords(MARKET_IMPACT_KEYWORDS)
+
+    _FINANCE_KEYWORD_PATTERN = _compile_keywords(FINANCE_KEYWORDS)
+
+    # 市场情绪正面词
+    POSITIVE_WORDS = ('上涨', '增长', '提升', '改善', '利好', '机会', '创新', '突破', '发展', '繁荣', '牛市', '反弹', '涨停', '高景气', '高增长', '高盈利', '高回报', '高预期', '高估值')
+
+    # 市场情绪负面词
+    NEGATIVE_WORDS = ('下跌', '下滑', '亏损', '恶化', '利空', '风险', '危机', '衰退', '萧条', '熊市', '回调', '跌停', '低景气', '低增长', '低盈利', '低回报', '低预期', '低估值')
+
+    # 核心提示中的投资建议，每条一行
+    INVESTMENT_ADVICE = (
+        "1. 关注政策面的变化和经济基本面的改善\n",
+        "2. 把握结构性投资机会，重点关注高景气行业\n",
+        "3. 控制风险，避免盲目跟风和追涨杀跌\n",
+        "4. 坚持价值投资理念，关注公司的基本面和长期发展潜力\n",
+    )
+
+    # 独特摘要的标题关键词与摘要，按优先级排列
+    UNIQUE_SUMMARIES = (
+        ('基金', '基金市场近期表现活跃，投资者可关注基金的长期业绩表现和基金经理的管理能力，选择适合自己风险偏好的基金产品。'),
+        ('ETF', 'ETF市场规模持续扩大，投资者可通过ETF把握不同行业的投资机会，实现资产的多元化配置。'),
+        ('股票', '股票市场近期波动较大，投资者应保持理性，关注公司的基本面和行业的发展趋势，避免盲目跟风。'),
+        ('金融', '金融行业是国民经济的重要组成部分，其发展状况直接关系到经济的稳定运行和增长质量。'),
+        ('市场', '市场的发展态势受到多种因素的影响，投资者应密切关注市场的变化趋势，了解市场热点和投资机会。'),
+        ('投资', '投资机会的把握需要投资者对市场、行业、公司有深入的了解和分析，制定合理的投资策略。'),
+        ('理财', '理财产品的选择应根据投资者的风险偏好和投资目标，选择适合自己的理财产品，实现资产的保值增值。'),
+    )
+
+    DEFAULT_UNIQUE_SUMMARY = '财经市场的动态变化受到多种因素的影响，投资者应保持理性，密切关注市场动态，制定合理的投资策略。'
+
     @classmethod
     def process_news(cls, news_list: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
         """
@@ -672,21 +1101,17 @@ class NewsProcessor:
             detail = news.get('detail', '')
             
             # 检查是否包含基金相关关键词
-            fund_keywords = ['基金', 'ETF', '股票', '金融', '市场', '投资', '理财']
-            if any(keyword in title or keyword in detail for keyword in fund_keywords):
-                # 分类新闻
-                industry = cls._classify_industry(title + detail)
-                news['industry'] = industry
-                
+            if cls._FUND_KEYWORD_PATTERN.search(title) or cls._FUND_KEYWORD_PATTERN.search(detail):
                 # 检查是否是市场影响新闻
-                market_impact_keywords = ['央行', '政策', '利率', '汇率', '关税', '外贸', '经济数据', 'GDP', 'CPI', 'PPI', 'PMI', '就业', '通胀', '通缩', '流动性', '资金面', '市场情绪', '风险偏好', '估值', '泡沫', '崩盘', '牛市', '熊市', '震荡', '反弹', '回调', '调整', '上涨', '下跌', '涨停', '跌停']
-                if any(keyword in title or keyword in detail for keyword in market_impact_keywords):
+                if cls._MARKET_IMPACT_KEYWORD_PATTERN.search(title) or cls._MARKET_IMPACT_KEYWORD_PATTERN.search(detail):
                     market_impact_news.append(news)
                 else:
                     industry_news.append(news)
         
-        # 合并所有相关新闻
-        all_related_news = market_impact_news + industry_news
+        # 合并所有相关新闻，最终只返回前10条，只为这些新闻拼接文本并分类
+        all_related_news = (market_impact_news + industry_news)[:10]
+        for news in all_related_news:
+            news['industry'] = cls._classify_industry(news.get('title', '') + news.get('detail', ''))
         
         # 如果基金相关新闻不足10条，添加更多新闻
         if len(all_related_news) < 10:
@@ -697,8 +1122,7 @@ class NewsProcessor:
                     detail = news.get('detail', '')
                     
                     # 检查是否包含财经相关关键词
-                    finance_keywords = ['财经', '经济', '金融', '市场', '投资', '理财', '股票', '基金', 'ETF', '债券', '期货', '外汇', '保险', '银行', '证券', '地产', '科技', '医药', '消费', '新能源', '汽车', '有色', '钢铁', '煤炭', '电力', '通信', '传媒', '教育', '军工', '环保', '交运', '公用']
-                    if any(keyword in title or keyword in detail for keyword in finance_keywords):
+                    if cls._FINANCE_KEYWORD_PATTERN.search(title) or cls._FINANCE_KEYWORD_PATTERN.search(detail):
                         # 分类新闻
                         industry = cls._classify_industry(title + detail)
                         news['industry'] = industry
@@ -763,6 +1187,8 @@ class NewsProcessor:
                 ]
             }
             
+            publish_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            
             # 克隆已有的新闻，确保标题和摘要都不同
             for i in range(10 - len(all_related_news)):
                 if all_related_news:
@@ -786,7 +1212,7 @@ class NewsProcessor:
                         'link': 'https://finance.eastmoney.com/',
                         'source': '东方财富网',
                         'detail': '近期财经市场呈现出复杂多变的态势，投资者需要保持理性，关注政策面的变化和经济基本面的改善，把握结构性投资机会。',
-                        'publish_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                        'publish_time': publish_time,
                         'industry': '金融'
                     }
                     all_related_news.append(default_news)
@@ -799,10 +1225,9 @@ class NewsProcessor:
         """
         根据文本内容分类行业
         """
-        for industry, keywords in cls.INDUSTRY_KEYWORDS.items():
-            for keyword in keywords:
-                if keyword in text:
-                    return industry
+        for keyword, industry in cls._INDUSTRY_KEYWORD_INDEX.items():
+            if keyword in text:
+                return industry
         return '其他'
 
     @classmethod
@@ -810,23 +1235,11 @@ class NewsProcessor:
         """
         生成独特的摘要
         """
-        # 基于标题生成摘要
-        if '基金' in title:
-            return '基金市场近期表现活跃，投资者可关注基金的长期业绩表现和基金经理的管理能力，选择适合自己风险偏好的基金产品。'
-        elif 'ETF' in title:
-            return 'ETF市场规模持续扩大，投资者可通过ETF把握不同行业的投资机会，实现资产的多元化配置。'
-        elif '股票' in title:
-            return '股票市场近期波动较大，投资者应保持理性，关注公司的基本面和行业的发展趋势，避免盲目跟风。'
-        elif '金融' in title:
-            return '金融行业是国民经济的重要组成部分，其发展状况直接关系到经济的稳定运行和增长质量。'
-        elif '市场' in title:
-            return '市场的发展态势受到多种因素的影响，投资者应密切关注市场的变化趋势，了解市场热点和投资机会。'
-        elif '投资' in title:
-            return '投资机会的把握需要投资者对市场、行业、公司有深入的了解和分析，制定合理的投资策略。'
-        elif '理财' in title:
-            return '理财产品的选择应根据投资者的风险偏好和投资目标，选择适合自己的理财产品，实现资产的保值增值。'
-        else:
-            return '财经市场的动态变化受到多种因素的影响，投资者应保持理性，密切关注市场动态，制定合理的投资策略。'
+        # 基于标题生成摘要，返回第一个出现在标题中的关键词对应的摘要
+        for keyword, summary in cls.UNIQUE_SUMMARIES:
+            if keyword in title:
+                return summary
+        return cls.DEFAULT_UNIQUE_SUMMARY
 
     @classmethod
     def generate_core_tip(cls, news_list: List[Dict[str, Any]]) -> str:
@@ -834,61 +1247,46 @@ class NewsProcessor:
         生成核心提示
         """
         # 统计行业分布
-        industry_count = {}
-        for news in news_list:
-            industry = news.get('industry', '其他')
-            industry_count[industry] = industry_count.get(industry, 0) + 1
+        industry_count = Counter(news.get('industry', '其他') for news in news_list)
         
-        # 找出最受关注的行业
-        top_industries = sorted(industry_count.items(), key=lambda x: x[1], reverse=True)[:3]
+        # 找出最受关注的行业，计数相同时按首次出现的顺序
+        top_industries = industry_count.most_common(3)
         
         # 分析市场情绪
         market_sentiment = cls._analyze_market_sentiment(news_list)
         
-        # 生成核心提示
-        core_tip = f"核心提示：\n"
+        # 生成核心提示，逐段收集后一次拼接
+        parts = ["核心提示：\n"]
         
         # 添加行业分析
         if top_industries:
-            core_tip += "\n行业关注：\n"
+            parts.append("\n行业关注：\n")
             for industry, count in top_industries:
-                core_tip += f"- {industry}行业（{count}条新闻）\n"
+                parts.append(f"- {industry}行业（{count}条新闻）\n")
         
         # 添加市场情绪分析
-        core_tip += f"\n市场情绪：{market_sentiment}\n"
+        parts.append(f"\n市场情绪：{market_sentiment}\n")
         
         # 添加投资建议
-        core_tip += "\n投资建议：\n"
-        core_tip += "1. 关注政策面的变化和经济基本面的改善\n"
-        core_tip += "2. 把握结构性投资机会，重点关注高景气行业\n"
-        core_tip += "3. 控制风险，避免盲目跟风和追涨杀跌\n"
-        core_tip += "4. 坚持价值投资理念，关注公司的基本面和长期发展潜力\n"
+        parts.append("\n投资建议：\n")
+        parts.extend(cls.INVESTMENT_ADVICE)
         
-        return core_tip
+        return ''.join(parts)
 
     @classmethod
     def _analyze_market_sentiment(cls, news_list: List[Dict[str, Any]]) -> str:
         """
         分析市场情绪
         """
-        positive_words = ['上涨', '增长', '提升', '改善', '利好', '机会', '创新', '突破', '发展', '繁荣', '牛市', '反弹', '涨停', '高景气', '高增长', '高盈利', '高回报', '高预期', '高估值']
-        negative_words = ['下跌', '下滑', '亏损', '恶化', '利空', '风险', '危机', '衰退', '萧条', '熊市', '回调', '跌停', '低景气', '低增长', '低盈利', '低回报', '低预期', '低估值']
-        
         positive_count = 0
         negative_count = 0
         
         for news in news_list:
             title = news.get('title', '')
             detail = news.get('detail', '')
-            text = title + detail
-            
-            for word in positive_words:
-                if word in text:
-                    positive_count += 1
-            
-            for word in negative_words:
-                if word in text:
-                    negative_count += 1
+            positive, negative = cls._count_sentiment_words(title + detail)
+            positive_count += positive
+            negative_count += negative
         
         if positive_count > negative_count:
             return '乐观'
@@ -897,6 +1295,16 @@ class NewsProcessor:
         else:
             return '中性'
 
+    @classmethod
+    @functools.lru_cache(maxsize=512)
+    def _count_sentiment_words(cls, text: str) -> Tuple[int, int]:
+        """
+        统计文本中出现的正面词和负面词个数，按文本缓存结果
+        """
+        positive = sum(1 for word in cls.POSITIVE_WORDS if word in text)
+        negative = sum(1 for word in cls.NEGATIVE_WORDS if word in text)
+        return positive, negative
+
 
 class FundAnalyzer:
     """
@@ -908,62 +1316,74 @@ class FundAnalyzer:
     3. 生成基金推荐
     """
 
+    # 使用真实的基金数据
+    REAL_FUNDS = (
+        {'code': '000001', 'name': '华夏成长混合', 'type': '混合型', 'return_rate': '12.5%', 'scale': '100亿', 'manager': '董阳阳'},
+        {'code': '000002', 'name': '华夏大盘精选混合', 'type': '混合型', 'return_rate': '15.8%', 'scale': '80亿', 'manager': '巩怀志'},
+        {'code': '001001', 'name': '华夏债券A', 'type': '债券型', 'return_rate': '5.2%', 'scale': '120亿', 'manager': '刘明宇'},
+        {'code': '003003', 'name': '华夏现金增利货币', 'type': '货币型', 'return_rate': '2.1%', 'scale': '200亿', 'manager': '曲波'},
+        {'code': '510050', 'name': '华夏上证50ETF', 'type': 'ETF', 'return_rate': '10.2%', 'scale': '150亿', 'manager': '荣膺'},
+        {'code': '510300', 'name': '华夏沪深300ETF', 'type': 'ETF', 'return_rate': '8.5%', 'scale': '130亿', 'manager': '赵宗庭'},
+        {'code': '510500', 'name': '华夏中证500ETF', 'type': 'ETF', 'return_rate': '14.3%', 'scale': '110亿', 'manager': '荣膺'},
+        {'code': '159952', 'name': '华夏创业板ETF', 'type': 'ETF', 'return_rate': '18.7%', 'scale': '90亿', 'manager': '荣膺'},
+        {'code': '007349', 'name': '华夏科技创新混合', 'type': '混合型', 'return_rate': '22.4%', 'scale': '70亿', 'manager': '周克平'},
+        {'code': '003834', 'name': '华夏能源革新股票', 'type': '股票型', 'return_rate': '25.6%', 'scale': '60亿', 'manager': '郑泽鸿'},
+    )
+
+    # 行业与推荐基金代码映射
+    INDUSTRY_FUND_MAPPING = {
+        '科技': ('510050', '007349'),
+        '金融': ('000001', '000002'),
+        '医药': ('001001', '003003'),
+        '消费': ('510300', '510500'),
+        '新能源': ('003834', '159952'),
+    }
+
+    # 基金代码到基金信息的索引，推荐时按代码直接查找
+    _FUNDS_BY_CODE = {fund['code']: fund for fund in REAL_FUNDS}
+
     @classmethod
     def _get_related_funds(cls, news_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         从新闻中提取相关基金
         """
-        # 使用真实的基金数据
-        real_funds = [
-            {'code': '000001', 'name': '华夏成长混合', 'type': '混合型', 'return_rate': '12.5%', 'scale': '100亿', 'manager': '董阳阳'},
-            {'code': '000002', 'name': '华夏大盘精选混合', 'type': '混合型', 'return_rate': '15.8%', 'scale': '80亿', 'manager': '巩怀志'},
-            {'code': '001001', 'name': '华夏债券A', 'type': '债券型', 'return_rate': '5.2%', 'scale': '120亿', 'manager': '刘明宇'},
-            {'code': '003003', 'name': '华夏现金增利货币', 'type': '货币型', 'return_rate': '2.1%', 'scale': '200亿', 'manager': '曲波'},
-            {'code': '510050', 'name': '华夏上证50ETF', 'type': 'ETF', 'return_rate': '10.2%', 'scale': '150亿', 'manager': '荣膺'},
-            {'code': '510300', 'name': '华夏沪深300ETF', 'type': 'ETF', 'return_rate': '8.5%', 'scale': '130亿', 'manager': '赵宗庭'},
-            {'code': '510500', 'name': '华夏中证500ETF', 'type': 'ETF', 'return_rate': '14.3%', 'scale': '110亿', 'manager': '荣膺'},
-            {'code': '159952', 'name': '华夏创业板ETF', 'type': 'ETF', 'return_rate': '18.7%', 'scale': '90亿', 'manager': '荣膺'},
-            {'code': '007349', 'name': '华夏科技创新混合', 'type': '混合型', 'return_rate': '22.4%', 'scale': '70亿', 'manager': '周克平'},
-            {'code': '003834', 'name': '华夏能源革新股票', 'type': '股票型', 'return_rate': '25.6%', 'scale': '60亿', 'manager': '郑泽鸿'},
-        ]
-        
+        industries = tuple(news.get('industry', '其他') for news in news_list)
+        return list(cls._recommend_funds(industries))
+
+    @classmethod
+    @functools.lru_cache(maxsize=512)
+    def _recommend_funds(cls, industries: Tuple[str, ...]) -> Tuple[Dict[str, Any], ...]:
+        """
+        根据新闻行业序列推荐基金，结果只取决于行业分布，按行业序列缓存
+        """
         # 根据新闻行业分类推荐基金
         recommended_funds = []
-        industry_fund_mapping = {
-            '科技': ['510050', '007349'],
-            '金融': ['000001', '000002'],
-            '医药': ['001001', '003003'],
-            '消费': ['510300', '510500'],
-            '新能源': ['003834', '159952'],
-        }
         
         # 统计新闻中的行业
-        industry_count = {}
-        for news in news_list:
-            industry = news.get('industry', '其他')
-            industry_count[industry] = industry_count.get(industry, 0) + 1
+        industry_count = Counter(industries)
         
-        # 找出最受关注的行业
-        top_industries = sorted(industry_count.items(), key=lambda x: x[1], reverse=True)[:2]
+        # 找出最受关注的行业，计数相同时按首次出现的顺序
+        top_industries = industry_count.most_common(2)
         
-        # 为每个行业推荐基金
+        # 为每个行业推荐基金，已推荐的基金代码记录在集合中去重
+        recommended_codes = set()
         for industry, _ in top_industries:
-            if industry in industry_fund_mapping:
-                fund_codes = industry_fund_mapping[industry]
-                for code in fund_codes:
-                    for fund in real_funds:
-                        if fund['code'] == code and fund not in recommended_funds:
-                            recommended_funds.append(fund)
+            for code in cls.INDUSTRY_FUND_MAPPING.get(industry, ()):
+                fund = cls._FUNDS_BY_CODE.get(code)
+                if fund is not None and code not in recommended_codes:
+                    recommended_codes.add(code)
+                    recommended_funds.append(fund)
         
         # 如果推荐基金不足4个，添加更多基金
         if len(recommended_funds) < 4:
-            for fund in real_funds:
-                if fund not in recommended_funds:
+            for fund in cls.REAL_FUNDS:
+                if fund['code'] not in recommended_codes:
+                    recommended_codes.add(fund['code'])
                     recommended_funds.append(fund)
                     if len(recommended_funds) >= 4:
                         break
         
-        return recommended_funds[:4]
+        return tuple(recommended_funds[:4])
 
 
 class HTMLGenerator:
@@ -973,47 +1393,37 @@ class HTMLGenerator:
     负责生成符合公众号模板的HTML文件
     """
 
-    @classmethod
-    def generate_html(cls, news_list: List[Dict[str, Any]], core_tip: str, related_funds: List[Dict[str, Any]]) -> str:
-        """
-        生成HTML内容
-        """
-        # 使用定义的核心提示内容
-        enhanced_core_tip = "核心提示：今日基金市场核心关注点：科技行业发展态势良好，为相关基金提供投资机会。\n\n航天行业发展态势良好，为相关基金提供投资机会。\n\n芯片行业传来重大利好，芯片价格持续上涨，相关企业业绩预期向好，芯片基金表现强势。\n\n消费行业特别是白酒板块有望迎来估值修复行情，春节消费数据超预期，相关基金值得布局。\n\nAI行业保持高景气度，技术突破和应用拓展为相关基金带来投资机会。\n\n市场影响方面：多板块出现上涨行情，芯片、AI等科技板块表现尤为突出，市场做多情绪浓厚。资金面保持充裕，北向资金持续流入，ETF市场交易活跃，增量资金入市为市场提供支撑。\n\n关键事件方面：\n\n投资建议：基于当前市场环境，建议投资者关注AI、芯片、新能源等景气度较高的行业基金，特别是存储芯片领域因供不应求而价格持续上涨，相关基金配置价值凸显。同时，可关注消费升级和医药创新等长期成长赛道，通过分散投资降低风险。在市场波动较大的情况下，保持理性投资心态，根据自身风险承受能力合理配置基金资产。"
-        
-        # 生成新闻项
-        news_items = ""
-        emojis = ['💡', '⚡', '🔬', '🚀', '⚡', '📈', '📈', '🎯', '💹', '⚡']
-        fund_mappings = [
-            '综合指数ETF(510300)、混合基金',
-            '芯片ETF(512760)、半导体ETF(512480)',
-            '金融科技ETF(159851)、证券ETF(512880)',
-            '红利低波ETF(512890)、央企红利ETF(561580)',
-            '新能源汽车ETF(515030)、光伏ETF(515790)',
-            '智能驾驶ETF(516520)、汽车ETF(516110)',
-            '游戏ETF(159869)、传媒ETF(512980)',
-            '云计算ETF(516510)、大数据产业ETF(516700)',
-            '消费ETF(510150)、白酒ETF(512690)',
-            '人工智能AI ETF(515070)、AI人工智能ETF(512930)'
-        ]
-        
-        for i, news in enumerate(news_list, 1):
-            title = news.get('title', '')
-            link = news.get('link', '')
-            detail = news.get('detail', '')
-            emoji = emojis[i-1] if i-1 < len(emojis) else '📰'
-            fund_mapping = fund_mappings[i-1] if i-1 < len(fund_mappings) else '相关基金'
-            
-            news_items += f"""
+    # 新闻条目图标，按顺序使用
+    ICONS = ('💡', '⚡', '🔬', '🚀', '⚡', '📈', '📈', '🎯', '💹', '⚡')
+
+    # 新闻条目关联基金，按顺序使用
+    FUND_MAPPINGS = (
+        '综合指数ETF(510300)、混合基金',
+        '芯片ETF(512760)、半导体ETF(512480)',
+        '金融科技ETF(159851)、证券ETF(512880)',
+        '红利低波ETF(512890)、央企红利ETF(561580)',
+        '新能源汽车ETF(515030)、光伏ETF(515790)',
+        '智能驾驶ETF(516520)、汽车ETF(516110)',
+        '游戏ETF(159869)、传媒ETF(512980)',
+        '云计算ETF(516510)、大数据产业ETF(516700)',
+        '消费ETF(510150)、白酒ETF(512690)',
+        '人工智能AI ETF(515070)、AI人工智能ETF(512930)'
+    )
+
+    # 单条新闻的HTML模板，使用str.format填充
+    NEWS_ITEM_TEMPLATE = """
             <div class="news-item">
                 <h3 style="font-weight: bold;">{emoji}{i}. <a href="{link}" target="_blank" style="font-weight: bold;">{title}</a></h3>
                 <div class="news-summary">摘要：{detail}</div>
                 <div class="news-meta">关联基金：{fund_mapping}</div>
             </div>
             """
-        
-        # HTML模板
-        html_template = """
+
+    # 使用定义的核心提示内容
+    ENHANCED_CORE_TIP = "核心提示：今日基金市场核心关注点：科技行业发展态势良好，为相关基金提供投资机会。\n\n航天行业发展态势良好，为相关基金提供投资机会。\n\n芯片行业传来重大利好，芯片价格持续上涨，相关企业业绩预期向好，芯片基金表现强势。\n\n消费行业特别是白酒板块有望迎来估值修复行情，春节消费数据超预期，相关基金值得布局。\n\nAI行业保持高景气度，技术突破和应用拓展为相关基金带来投资机会。\n\n市场影响方面：多板块出现上涨行情，芯片、AI等科技板块表现尤为突出，市场做多情绪浓厚。资金面保持充裕，北向资金持续流入，ETF市场交易活跃，增量资金入市为市场提供支撑。\n\n关键事件方面：\n\n投资建议：基于当前市场环境，建议投资者关注AI、芯片、新能源等景气度较高的行业基金，特别是存储芯片领域因供不应求而价格持续上涨，相关基金配置价值凸显。同时，可关注消费升级和医药创新等长期成长赛道，通过分散投资降低风险。在市场波动较大的情况下，保持理性投资心态，根据自身风险承受能力合理配置基金资产。"
+
+    # HTML页面模板
+    PAGE_TEMPLATE = """
 <!DOCTYPE html>
 <html lang="zh-CN">
 <head>
@@ -1114,12 +1524,38 @@ class HTMLGenerator:
 </body>
 </html>
         """
+
+    # 核心提示和页面模板都是常量，在类定义时替换好核心提示并按新闻项位置拆分为首尾两段，优化换行符处理，减少空行
+    _PAGE_PREFIX, _PAGE_SUFFIX = PAGE_TEMPLATE.replace(
+        '{core_tip}', ENHANCED_CORE_TIP.replace('\n\n', '<br>').replace('\n', '<br>')
+    ).split('{news_items}')
+
+    @classmethod
+    def generate_html(cls, news_list: List[Dict[str, Any]], core_tip: str, related_funds: List[Dict[str, Any]]) -> str:
+        """
+        生成HTML内容
+        """
+        # 生成新闻项，逐条收集后一次拼接
+        news_item_parts = []
         
-        # 替换模板变量，优化换行符处理，减少空行
-        html_content = html_template.replace('{core_tip}', enhanced_core_tip.replace('\n\n', '<br>').replace('\n', '<br>'))
-        html_content = html_content.replace('{news_items}', news_items)
+        # 图标和关联基金按顺序分配，超出预设数量后使用默认值
+        emoji_iter = itertools.chain(cls.ICONS, itertools.repeat('📰'))
+        fund_mapping_iter = itertools.chain(cls.FUND_MAPPINGS, itertools.repeat('相关基金'))
+        
+        for i, (news, emoji, fund_mapping) in enumerate(zip(news_list, emoji_iter, fund_mapping_iter), 1):
+            title = news.get('title', '')
+            link = news.get('link', '')
+            detail = news.get('detail', '')
+            
+            # 抓取的文本可能含有<、&、引号等字符，填入模板前统一转义
+            news_item_parts.append(cls.NEWS_ITEM_TEMPLATE.format(
+                emoji=emoji, i=i, link=html_escape(link), title=html_escape(title),
+                detail=html_escape(detail), fund_mapping=fund_mapping
+            ))
+        news_items = ''.join(news_item_parts)
         
-        return html_content
+        # 页面首尾在类定义时已填好核心提示，这里只需拼接新闻项
+        return ''.join((cls._PAGE_PREFIX, news_items, cls._PAGE_SUFFIX))
 
 
 class App:
@@ -1143,42 +1579,33 @@ class App:
         logger.info("开始获取财经新闻...")
         
         try:
-            # 获取新闻
-            print("获取东方财富网新闻...")
-            eastmoney_news = self.news_fetcher.fetch_eastmoney_news(20)
-            print(f"东方财富网新闻获取完成，共 {len(eastmoney_news)} 条")
-            
-            print("获取新浪财经新闻...")
-            sina_news = self.news_fetcher.fetch_sina_finance_news(20)
-            print(f"新浪财经新闻获取完成，共 {len(sina_news)} 条")
-            
-            print("获取每日经济新闻...")
-            nbd_news = self.news_fetcher.fetch_nbd_news(20)
-            print(f"每日经济新闻获取完成，共 {len(nbd_news)} 条")
-            
-            print("获取同花顺财经新闻...")
-            jqka_news = self.news_fetcher.fetch_10jqka_news(20)
-            print(f"同花顺财经新闻获取完成，共 {len(jqka_news)} 条")
-            
-            # 合并新闻列表
-            all_news = eastmoney_news + sina_news + nbd_news + jqka_news
+            # 清理过期缓存，缓存目录在定时任务之间保留，需要控制其大小
+            removed = self.news_fetcher.prune_http_cache()
+            if removed:
+                logger.info(f"已清理过期缓存 {removed} 个")
+
+            # 并发获取各来源新闻并合并
+            print("获取东方财富网、新浪财经、每日经济新闻、同花顺财经新闻...")
+            all_news = self.news_fetcher.get_finance_news(20)
             print(f"合并新闻列表完成，共 {len(all_news)} 条")
             
-            # 去重
-            unique_news = []
-            seen_titles = set()
-            seen_detail_prefixes = set()
+            # 去重：以归一化标题为键的字典按插入顺序保留首次出现的新闻，同时用摘要前100个字符的摘要值排除内容重复
+            unique_by_title = {}
+            seen_detail_keys = set()
             for news in all_news:
                 title = news.get('title', '')
                 detail = news.get('detail', '')
-                # 确保标题不重复，并且摘要的前100个字符
-                if title and detail and title not in seen_titles:
-                    # 检查摘要前缀是否重复
-                    detail_prefix = detail[:100] if len(detail) > 100 else detail
-                    if detail_prefix not in seen_detail_prefixes:
-                        seen_titles.add(title)
-                        seen_detail_prefixes.add(detail_prefix)
-                        unique_news.append(news)
+                if not title or not detail:
+                    continue
+                title_key = _title_key(title)
+                if title_key in unique_by_title:
+                    continue
+                # 16字节的blake2b摘要代替长中文字符串作为集合键，占用更少内存
+                detail_key = hashlib.blake2b(detail[:100].encode('utf-8'), digest_size=16).digest()
+                if detail_key not in seen_detail_keys:
+                    seen_detail_keys.add(detail_key)
+                    unique_by_title[title_key] = news
+            unique_news = list(unique_by_title.values())
             print(f"去重完成，共 {len(unique_news)} 条")
             
             # 处理新闻，过滤出基金相关新闻
@@ -1208,8 +1635,13 @@ class App:
             # 保存HTML到文件
             output_file = 'index.html'
             print(f"保存HTML到文件: {output_file}")
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            # 一次性编码为UTF-8字节后以二进制方式写入，跳过文本层的逐段编码
+            html_bytes = html_content.encode('utf-8')
+            # 先写入临时文件再原子替换，读取方不会看到写了一半的页面
+            tmp_file = f"{output_file}.tmp"
+            with open(tmp_file, 'wb', buffering=1 << 20) as f:
+                f.write(html_bytes)
+            os.replace(tmp_file, output_file)
             print(f"HTML文件保存完成: {output_file}")
             
             logger.info(f"HTML文件已生成: {output_file}")